@@ -8,28 +8,133 @@
 #  - GET /measurements?location=.. -> time series for a station
 #  - GET /weather?lat=..&lon=..    -> current weather (Open-Meteo)
 #  - GET /forecast?lat=..&lon=..&days=14 -> daily forecast (Open-Meteo) or naive if offline
+#  - GET /weather-and-forecast?lat=..&lon=..&days=14 -> both of the above in one upstream call
 #
 # Run: uvicorn main:app --reload
+import asyncio
+import importlib.util
 import random
 import os
+import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-import requests
+from typing import Any, Callable
+from urllib.parse import quote
+import httpx
+import orjson
+from cachetools import TLRUCache
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
 from dotenv import load_dotenv
 
+try:
+	import zstandard
+except ImportError:  # optional: without it, cache entries are kept uncompressed
+	zstandard = None
+
+try:
+	import redis.asyncio as redis
+except ImportError:  # optional: only needed when REDIS_URL is set
+	redis = None
+
 load_dotenv()
 
 # --- Configuration and setup ---
 OPENAQ_API_KEY = os.getenv("OPENAQ_API_KEY")
 HEADERS = {"X-API-Key": OPENAQ_API_KEY} if OPENAQ_API_KEY else {}
 OPENMETEO_BASE = "https://api.open-meteo.com/v1/forecast"
-CACHE = {}
-CACHE_TTL = 3600  # Cache Time-to-Live in seconds
-
-app = FastAPI()
+FORECAST_MAX_DAYS = 16  # Longest forecast Open-Meteo provides
+REDIS_URL = os.getenv("REDIS_URL")  # Shared second-level cache across workers and restarts, if set
+CACHE_WARMUP = os.getenv("CACHE_WARMUP") == "1"  # Prime the cache for static endpoints at startup
+WARMUP_COUNTRIES = ["US", "UZ", "IN", "GB", "DE", "FR", "CN", "JP"]
+CACHE_TTL = 3600  # Default cache Time-to-Live in seconds
+STALE_MAX = 24 * 3600  # Expired entries may still be served for this long if the upstream API fails
+CACHE_MAXSIZE = 2048  # Least recently used entries are evicted beyond this many
+CACHE_COMPRESS_MIN = 4096  # Entries whose JSON is larger than this many bytes are stored zstd-compressed
+
+# Per-endpoint cache Time-to-Live in seconds: volatile data refreshes often, static data lives longer
+TTL_POLICY = {
+	"countries": 86400 * 7,
+	"cities": 86400,
+	"air_quality": 600,
+	"measurements": 300,
+	"weather": 120,
+	# Negative caching: empty results and upstream failures are remembered briefly so that
+	# unknown cities or outages don't send every retry to the upstream API
+	"air_quality_negative": 300,
+	"cities_negative": 300,
+	"error": 60,
+}
+
+
+def _cache_ttu(_key, entry, _now):
+	"""Drops an entry from memory once it is too old to be served even as stale data."""
+	return entry["stale_until"]
+
+
+# Bounded LRU cache; freshness is still checked per entry so stale data can back up failed requests
+CACHE = TLRUCache(maxsize=CACHE_MAXSIZE, ttu=_cache_ttu)
+INFLIGHT: dict[str, asyncio.Future] = {}  # Upstream fetches in progress, keyed by cache key
+ZSTD_COMPRESSOR = zstandard.ZstdCompressor(level=3) if zstandard else None
+ZSTD_DECOMPRESSOR = zstandard.ZstdDecompressor() if zstandard else None
+
+# Redis client for the shared cache (L2 behind the in-process CACHE); opened by the lifespan when
+# REDIS_URL is set. Configure the server with maxmemory-policy allkeys-lfu so hot keys survive eviction.
+REDIS = None
+REDIS_PREFIX = "clean_sky:"
+REDIS_TIMEOUT = 0.5  # Seconds; a slow or unreachable Redis is treated as a miss rather than stalling requests
+
+# HTTP/2 lets concurrent calls to one host share a single connection; httpx needs the
+# optional 'h2' package for it (pip install httpx[http2]), so fall back to HTTP/1.1 without it
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Shared async HTTP client so outbound calls never block the event loop and reuse pooled
+# keep-alive connections; opened and closed by the application lifespan below
+ASYNC_CLIENT: httpx.AsyncClient = None
+
+
+class ORJSONResponse(JSONResponse):
+	"""JSON response encoded with orjson, which is several times faster than the stdlib json module."""
+
+	def render(self, content) -> bytes:
+		return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+	"""
+    Opens the shared async HTTP client on startup and closes it on shutdown.
+    With REDIS_URL set, also connects the shared Redis cache.
+    With CACHE_WARMUP=1, also prefetches /countries and /cities for WARMUP_COUNTRIES.
+    """
+	global ASYNC_CLIENT, REDIS
+	if REDIS_URL:
+		if redis is None:
+			log("REDIS_URL is set but the 'redis' package is not installed; using the in-process cache only")
+		else:
+			REDIS = redis.Redis.from_url(
+				REDIS_URL, socket_connect_timeout=REDIS_TIMEOUT, socket_timeout=REDIS_TIMEOUT
+			)
+	ASYNC_CLIENT = httpx.AsyncClient(
+		headers=HEADERS,
+		timeout=10.0,
+		transport=httpx.AsyncHTTPTransport(
+			retries=2,
+			http2=HTTP2,
+			limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60.0),
+		),
+	)
+	if CACHE_WARMUP:
+		await warmup()
+	yield
+	await ASYNC_CLIENT.aclose()
+	if REDIS is not None:
+		await REDIS.aclose()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 # CORS Middleware
 app.add_middleware(
@@ -45,65 +150,236 @@ def log(*args):
 	print("[clean_sky]", *args)
 
 
-def fetch_and_cache(url: str, headers: dict = None, fallback_data=None, cache_key: str = None):
+def _norm(s: str) -> str:
 	"""
-    Fetches data from a URL with caching and error handling.
-    If the request fails, it returns the provided fallback data.
+    Normalizes a user-supplied name, so 'Tashkent' and ' Tashkent ' share a cache entry.
+    The same value must be sent upstream; case is kept because OpenAQ matches names as given.
     """
-	cache_key = cache_key or url
-	now = datetime.now()
+	return s.strip()
+
+
+def _grid(x: float) -> str:
+	"""Rounds a coordinate to a ~1 km grid so nearby weather lookups share a cache entry."""
+	return f"{round(x, 2):.2f}"
+
+
+def cache_get(cache_key: str, allow_stale: bool = False):
+	"""
+    Returns the cached data for a key, or None if it is missing or older than its TTL.
+    With allow_stale, expired entries are still returned until they are STALE_MAX seconds old.
+    Expiry uses the monotonic clock so wall-clock adjustments don't affect it.
+    """
+	entry = CACHE.get(cache_key)
+	if entry and entry["stale_until" if allow_stale else "expires_at"] > time.monotonic():
+		return _entry_data(entry)
+	return None
+
+
+def _entry_data(entry):
+	"""Returns the data of a cache entry, decompressing it if it was stored compressed."""
+	if "blob" in entry:
+		return orjson.loads(ZSTD_DECOMPRESSOR.decompress(entry["blob"]))
+	return entry["data"]
+
+
+def cache_set(cache_key: str, data, ttl: int = CACHE_TTL, etag: str = None, last_modified: str = None):
+	"""
+    Stores data in the cache under a key, fresh for 'ttl' seconds.
+    The upstream ETag / Last-Modified validators are kept for conditional refreshes.
+    Large entries (e.g. OpenAQ station lists) are stored as zstd-compressed JSON to save memory.
+    """
+	now = time.monotonic()
+	entry = {
+		"expires_at": now + ttl,
+		"stale_until": now + max(ttl, STALE_MAX),
+		"etag": etag,
+		"last_modified": last_modified,
+	}
+	blob = orjson.dumps(data) if ZSTD_COMPRESSOR else None
+	if blob is not None and len(blob) > CACHE_COMPRESS_MIN:
+		entry["blob"] = ZSTD_COMPRESSOR.compress(blob)
+	else:
+		entry["data"] = data
+	CACHE[cache_key] = entry
+
+
+async def dedupe_inflight(cache_key: str, fetch):
+	"""
+    Runs the 'fetch' coroutine function once per cache key at a time.
+    Concurrent callers for the same key await the result of the fetch already in progress.
+    The fetch runs as its own task, so a cancelled caller doesn't cancel it for the others.
+    """
+	task = INFLIGHT.get(cache_key)
+	if task is None:
+		task = asyncio.ensure_future(fetch())
+		INFLIGHT[cache_key] = task
+		task.add_done_callback(lambda t: _inflight_done(cache_key, t))
+	return await asyncio.shield(task)
 
-	# Check cache
-	if cache_key in CACHE and (now - CACHE[cache_key]["timestamp"]).total_seconds() < CACHE_TTL:
-		return CACHE[cache_key]["data"]
 
-	# Fetch new data
+def _inflight_done(cache_key: str, task: asyncio.Future):
+	"""Forgets a finished fetch and marks its exception as retrieved if no caller was left to see it."""
+	if INFLIGHT.get(cache_key) is task:
+		del INFLIGHT[cache_key]
+	if not task.cancelled():
+		task.exception()
+
+
+async def _get_cached(cache_key: str, ttl, producer, fallback_factory: Callable[[], Any] = None):
+	"""
+    Common cache primitive: returns fresh cached data for a key, or awaits producer() for it.
+    The producer returns (data, validators), where validators holds the etag / last_modified
+    to store with the entry. Concurrent misses for a key share one producer call.
+    'ttl' is in seconds, or a function of the produced data (e.g. shorter for empty results).
+    If the producer raises httpx.HTTPError or gets a non-JSON body, stale data is served if
+    there is any, otherwise the result of fallback_factory(), which is cached briefly.
+    """
+	cached = cache_get(cache_key)
+	if cached is not None:
+		return cached
+
+	return await dedupe_inflight(cache_key, lambda: _produce(cache_key, ttl, producer, fallback_factory))
+
+
+async def _produce(cache_key: str, ttl, producer, fallback_factory: Callable[[], Any] = None):
+	"""
+    Checks the shared Redis cache, then runs the producer and caches its result in both
+    levels, falling back on upstream errors (see _get_cached).
+    """
+	shared = await redis_get(cache_key)
+	if shared is not None:
+		return shared
+
 	try:
-		resp = requests.get(url, headers=headers, timeout=10)
-		resp.raise_for_status()
-		data = resp.json()
-
-		# Store in cache
-		CACHE[cache_key] = {"data": data, "timestamp": now}
-		return data
-	except requests.RequestException as e:
-		log(f"API request to {url} failed: {e}")
+		data, validators = await producer()
+	except (httpx.HTTPError, ValueError) as e:  # ValueError: body is not valid JSON
+		log(f"Upstream request for {cache_key} failed: {e}")
+		stale = cache_get(cache_key, allow_stale=True)
+		if stale is not None:
+			log(f"Serving stale cache for {cache_key}")
+			# Treat the stale copy as fresh for a short while so an outage isn't retried on every
+			# request; stale_until is left alone so failures don't extend how long it can be served
+			CACHE[cache_key]["expires_at"] = time.monotonic() + TTL_POLICY["error"]
+			return stale
+		fallback_data = fallback_factory() if fallback_factory is not None else None
+		if fallback_data is not None:
+			cache_set(cache_key, fallback_data, TTL_POLICY["error"])
 		return fallback_data
 
+	# Store in cache
+	ttl = ttl(data) if callable(ttl) else ttl
+	cache_set(cache_key, data, ttl, **validators)
+	await redis_set(cache_key, data, ttl)
+	return data
+
+
+async def redis_get(cache_key: str):
+	"""
+    Returns data for a key from the shared Redis cache and copies it into the in-process cache
+    for its remaining TTL. Returns None on a miss, or if Redis is not configured or unavailable.
+    """
+	if REDIS is None:
+		return None
+	try:
+		async with REDIS.pipeline(transaction=False) as pipe:
+			blob, remaining = await pipe.get(REDIS_PREFIX + cache_key).ttl(REDIS_PREFIX + cache_key).execute()
+	except redis.RedisError as e:
+		log(f"Redis get for {cache_key} failed: {e}")
+		return None
+	if blob is None or remaining <= 0:
+		return None
+
+	data = orjson.loads(blob)
+	cache_set(cache_key, data, remaining)
+	return data
+
+
+async def redis_set(cache_key: str, data, ttl: int):
+	"""Stores data in the shared Redis cache for 'ttl' seconds, if Redis is configured."""
+	if REDIS is None:
+		return
+	try:
+		await REDIS.set(REDIS_PREFIX + cache_key, orjson.dumps(data), ex=ttl)
+	except redis.RedisError as e:
+		log(f"Redis set for {cache_key} failed: {e}")
+
+
+async def fetch_and_cache(url: str, ttl=CACHE_TTL, fallback_data=None, cache_key: str = None,
+						  fallback_factory: Callable[[], Any] = None):
+	"""
+    Fetches JSON from a URL with caching and error handling.
+    Cached data is reused for 'ttl' seconds; 'ttl' may also be a function of the fetched data.
+    If the request fails, it returns the provided fallback data, or builds it with
+    'fallback_factory' so that expensive fallbacks cost nothing when the request succeeds.
+    """
+	cache_key = cache_key or url
+	if fallback_factory is None and fallback_data is not None:
+		def fallback_factory():
+			return fallback_data
+	return await _get_cached(cache_key, ttl, lambda: _fetch(url, cache_key), fallback_factory)
+
+
+async def _fetch(url: str, cache_key: str):
+	"""
+    Fetches JSON from a URL, returning (data, validators) for _get_cached.
+    An expired entry is revalidated with If-None-Match / If-Modified-Since, so unchanged
+    data comes back as an empty 304 and the cached body is reused.
+    """
+	entry = CACHE.get(cache_key)
+	headers = {}
+	if entry and entry["etag"]:
+		headers["If-None-Match"] = entry["etag"]
+	if entry and entry["last_modified"]:
+		headers["If-Modified-Since"] = entry["last_modified"]
+
+	resp = await ASYNC_CLIENT.get(url, headers=headers)
+	if resp.status_code == 304 and headers:
+		return _entry_data(entry), {"etag": entry["etag"], "last_modified": entry["last_modified"]}
+
+	resp.raise_for_status()
+	data = orjson.loads(resp.content)
+	return data, {"etag": resp.headers.get("ETag"), "last_modified": resp.headers.get("Last-Modified")}
+
+
+async def warmup():
+	"""Fills the cache for rarely-changing endpoints so the first user requests are served from memory."""
+	log(f"Warming cache for countries and cities in {', '.join(WARMUP_COUNTRIES)}")
+	await asyncio.gather(
+		get_countries(),
+		*(get_cities(country=c) for c in WARMUP_COUNTRIES),
+		return_exceptions=True,
+	)
+
 
 # --- Endpoints ---
 @app.get("/")
-def read_root():
+async def read_root():
 	"""Endpoint for a simple 'hello' message."""
 	return {"message": "Welcome to the CleanSky API!"}
 
 
 @app.get("/countries")
-def get_countries():
+async def get_countries():
 	"""Lists all countries with air quality data."""
 	url = "https://api.openaq.org/v3/countries"
 	fallback = {"results": [{"code": "UZ", "name": "Uzbekistan"}, {"code": "US", "name": "United States"}]}
-	data = fetch_and_cache(url, headers=HEADERS, fallback_data=fallback, cache_key="countries")
+	data = await fetch_and_cache(url, TTL_POLICY["countries"], fallback_data=fallback, cache_key="countries")
 
 	countries = [{"code": c["code"], "name": c["name"]} for c in data.get("results", [])]
 	return {"countries": countries}
 
 
 @app.get("/cities")
-def get_cities(country: str = Query(..., description="ISO 2-letter country code")):
+async def get_cities(country: str = Query(..., description="ISO 2-letter country code")):
 	"""
     Lists cities for a given country with air quality data.
     """
-	url = f"https://api.openaq.org/v3/locations?country={country}&limit=1000"
+	country = _norm(country).upper()
+	url = f"https://api.openaq.org/v3/locations?country={quote(country, safe='')}&limit=1000"
 	fallback_results = [{"city": "Tashkent"}, {"city": "New York"}, {"city": "Delhi"}]
-	data = fetch_and_cache(url, headers=HEADERS, fallback_data={"results": []}, cache_key=f"cities_{country}")
+	data = await fetch_and_cache(url, _cities_ttl, fallback_data={"results": []}, cache_key=f"cities_{country}")
 
-	cities = set()
-	for loc in data.get("results", []):
-		if loc.get("boundary") and loc["boundary"].get("city"):
-			cities.add(loc["boundary"]["city"])
-
-	sorted_cities = sorted(list(cities))
+	sorted_cities = city_names(data)
 
 	if not sorted_cities:
 		# If API returns no data, use a fallback
@@ -112,143 +388,197 @@ def get_cities(country: str = Query(..., description="ISO 2-letter country code"
 	return {"cities": [{"city": c} for c in sorted_cities]}
 
 
+def city_names(data) -> list:
+	"""Returns the sorted, unique city names from an OpenAQ /locations response."""
+	cities = set()
+	for loc in data.get("results", []):
+		if loc.get("boundary") and loc["boundary"].get("city"):
+			cities.add(loc["boundary"]["city"])
+	return sorted(cities)
+
+
+def _cities_ttl(data) -> int:
+	"""Caches a country without any cities only briefly."""
+	return TTL_POLICY["cities"] if city_names(data) else TTL_POLICY["cities_negative"]
+
+
 # -------- Air Quality ----------
 @app.get("/air-quality")
-def air_quality(city: str = Query(..., description="Name of the city")):
+async def air_quality(city: str = Query(..., description="Name of the city")):
     """
     Returns aggregated air quality data and a list of stations for a given city.
     Uses caching and fetches data from OpenAQ v3.
     """
+    city = _norm(city)
     cache_key = f"air_quality_{city}"
+    return await _get_cached(cache_key, _air_quality_ttl, lambda: fetch_air_quality(city), _air_quality_fallback)
 
-    # Check for cached data
-    now = datetime.now()
-    if cache_key in CACHE and (now - CACHE[cache_key]["timestamp"]).total_seconds() < CACHE_TTL:
-        return CACHE[cache_key]["data"]
-
-    try:
-        # Step 1: find locations for this city
-        # Note: OpenAQ v3's location names are not always consistent for a city, so we must fetch and handle each separately.
-        loc_url = f"https://api.openaq.org/v3/locations?city={city}&limit=5"
-        loc_resp = requests.get(loc_url, headers=HEADERS, timeout=10)
-        loc_resp.raise_for_status()
-        loc_data = loc_resp.json().get("results", [])
-
-        if not loc_data:
-            raise HTTPException(status_code=404, detail="No locations found for this city.")
-
-        aggregated_values = {}
-        all_stations = []
-
-        # Step 2: Fetch latest data for each location individually
-        for loc in loc_data:
-            # The 'location' name is required for the /latest endpoint
-            location_name = loc.get("name") or loc.get("location")
-            if not location_name:
-                continue
-
-            try:
-                latest_url = f"https://api.openaq.org/v3/latest?location={location_name}&limit=200"
-                latest_resp = requests.get(latest_url, headers=HEADERS, timeout=10)
-                latest_resp.raise_for_status()
-                latest_data = latest_resp.json().get("results", [])
-
-                for station in latest_data:
-                    all_stations.append(station)
-                    for m in station.get("measurements", []):
-                        param = m["parameter"]
-                        value = m["value"]
-                        aggregated_values.setdefault(param, []).append(value)
-            except requests.RequestException as e:
-                log(f"Failed to fetch latest data for location {location_name}: {e}")
-                # Continue to the next location if one request fails
 
-        # Step 3: Average pollutant values
-        avg = {param: sum(vals) / len(vals) for param, vals in aggregated_values.items() if vals}
+def _air_quality_ttl(data) -> int:
+    """Caches a city without any OpenAQ locations only briefly."""
+    return TTL_POLICY["air_quality_negative"] if data.get("note") == "empty" else TTL_POLICY["air_quality"]
 
-        result = {
-            "aggregated": avg,
-            "last_updated": datetime.utcnow().isoformat() + "Z",
-            "locations": all_stations,
-        }
 
-        # Cache the result
-        CACHE[cache_key] = {"data": result, "timestamp": now}
+def _air_quality_fallback():
+    """Dummy air quality data for when OpenAQ is unreachable and nothing is cached."""
+    return {
+        "aggregated": {"pm25": 20, "pm10": 35, "no2": 15},
+        "last_updated": datetime.utcnow().isoformat() + "Z",
+        "locations": [],
+    }
+
 
-        return result
+async def fetch_air_quality(city: str):
+    """Fetches and aggregates air quality for a city from OpenAQ v3, returning (data, validators)."""
+    # Step 1: find locations for this city
+    # Note: OpenAQ v3's location names are not always consistent for a city, so we must fetch and handle each separately.
+    loc_url = f"https://api.openaq.org/v3/locations?city={quote(city, safe='')}&limit=5"
+    loc_resp = await ASYNC_CLIENT.get(loc_url)
+    loc_resp.raise_for_status()
+    loc_data = orjson.loads(loc_resp.content).get("results", [])
 
-    except requests.RequestException as e:
-        log(f"OpenAQ /air-quality failed for city {city}: {e}")
-        # Fallback with dummy data
-        fallback_data = {
-            "aggregated": {"pm25": 20, "pm10": 35, "no2": 15},
+    if not loc_data:
+        # No locations found for this city: cached briefly (see _air_quality_ttl)
+        return {
+            "aggregated": {},
             "last_updated": datetime.utcnow().isoformat() + "Z",
             "locations": [],
-        }
-        return fallback_data
-    except HTTPException as e:
-        return JSONResponse(status_code=e.status_code, content={"detail": e.detail})
+            "note": "empty",
+        }, {}
+
+    aggregated_values = {}  # param -> [running sum, count]
+    all_stations = []
+
+    # Step 2: Fetch latest data for all locations concurrently
+    # The 'location' name is required for the /latest endpoint
+    names = [loc.get("name") or loc.get("location") for loc in loc_data]
+    names = [n for n in names if n]
+    tasks = [ASYNC_CLIENT.get(f"https://api.openaq.org/v3/latest?location={quote(n, safe='')}&limit=200")
+             for n in names]
+    responses = await asyncio.gather(*tasks, return_exceptions=True)
+
+    for location_name, latest_resp in zip(names, responses):
+        try:
+            if isinstance(latest_resp, Exception):
+                raise latest_resp
+            latest_resp.raise_for_status()
+            latest_data = orjson.loads(latest_resp.content).get("results", [])
+
+            for station in latest_data:
+                all_stations.append(station)
+                for m in station.get("measurements", []):
+                    try:
+                        param = m["parameter"]
+                        value = m["value"]
+                    except (KeyError, TypeError):
+                        continue
+                    if not isinstance(value, (int, float)):
+                        continue
+                    entry = aggregated_values.get(param)
+                    if entry is None:
+                        aggregated_values[param] = [value, 1]
+                    else:
+                        entry[0] += value
+                        entry[1] += 1
+        except (httpx.HTTPError, ValueError) as e:
+            log(f"Failed to fetch latest data for location {location_name}: {e}")
+            # Continue to the next location if one request fails
+
+    # Step 3: Average pollutant values
+    avg = {param: total / count for param, (total, count) in aggregated_values.items() if count}
+
+    result = {
+        "aggregated": avg,
+        "last_updated": datetime.utcnow().isoformat() + "Z",
+        "locations": all_stations,
+    }
+    return result, {}
 
 
 @app.get("/measurements")
-def measurements(location: str = Query(...), parameter: str = "pm25", limit: int = 100):
+async def measurements(location: str = Query(...), parameter: str = "pm25", limit: int = 100):
 	"""
     Returns time-series measurements for a specific location and parameter.
     """
-	url = f"https://api.openaq.org/v3/measurements?location={location}&parameter={parameter}&limit={limit}&sort=desc"
-	fallback = {
-		"results": [{"date": {"utc": (datetime.utcnow() - timedelta(hours=i)).isoformat() + "Z"}, "value": 10 + i % 5}
-					for i in range(limit)]
-	}
-	data = fetch_and_cache(url, headers=HEADERS, fallback_data=fallback,
-						   cache_key=f"measurements_{location}_{parameter}")
+	location, parameter = _norm(location), _norm(parameter)
+	url = (f"https://api.openaq.org/v3/measurements?location={quote(location, safe='')}"
+		   f"&parameter={quote(parameter, safe='')}&limit={limit}&sort=desc")
+	def fallback():
+		return {
+			"results": [{"date": {"utc": (datetime.utcnow() - timedelta(hours=i)).isoformat() + "Z"}, "value": 10 + i % 5}
+						for i in range(limit)]
+		}
+
+	data = await fetch_and_cache(url, TTL_POLICY["measurements"], fallback_factory=fallback,
+						   cache_key=f"measurements_{location}_{parameter}_{limit}")
 
 	return data
 
 
+# -------- Weather ----------
+async def weather_and_forecast_data(lat: float, lon: float):
+	"""
+    Fetches current weather and the longest daily forecast for a point in a single Open-Meteo call.
+    /weather, /forecast and /weather-and-forecast all share this cached response.
+    Returns None if Open-Meteo fails and nothing is cached.
+    """
+	lat, lon = _grid(lat), _grid(lon)
+	url = (f"{OPENMETEO_BASE}?latitude={lat}&longitude={lon}&current_weather=true"
+		   f"&daily=temperature_2m_max,temperature_2m_min,precipitation_sum"
+		   f"&forecast_days={FORECAST_MAX_DAYS}&timezone=auto")
+	# Current weather is part of the response, so it expires on the weather TTL
+	return await fetch_and_cache(url, TTL_POLICY["weather"], cache_key=f"weather_forecast_{lat}_{lon}")
+
+
+def first_days(daily: dict, days: int) -> dict:
+	"""Trims each Open-Meteo daily series to the first 'days' days."""
+	return {k: v[:days] if isinstance(v, list) else v for k, v in daily.items()}
+
+
+def naive_forecast(days: int, temp: float = 20) -> dict:
+	"""Builds a rough daily forecast around 'temp' for when Open-Meteo is unreachable."""
+	today = datetime.utcnow().date()
+	uniform = random.uniform
+	dates = [(today + timedelta(days=i)).isoformat() for i in range(days)]
+	tmax = [round(temp + 5 + uniform(-3, 3), 1) for _ in range(days)]
+	tmin = [round(temp - 2 + uniform(-3, 3), 1) for _ in range(days)]
+	precip = [round(uniform(0, 5), 1) for _ in range(days)]  # uniform(0, 5) is never negative
+
+	return {"time": dates, "temperature_2m_max": tmax, "temperature_2m_min": tmin, "precipitation_sum": precip}
+
+
 @app.get("/weather")
-def current_weather(lat: float = Query(...), lon: float = Query(...)):
+async def current_weather(lat: float = Query(...), lon: float = Query(...)):
 	"""Returns current weather (temperature, windspeed, weathercode) from Open-Meteo."""
-	url = f"{OPENMETEO_BASE}?latitude={lat}&longitude={lon}&current_weather=true&timezone=auto"
-	try:
-		resp = requests.get(url, timeout=8)
-		resp.raise_for_status()
-		data = resp.json()
-		return {"source": "open-meteo", "current_weather": data.get("current_weather")}
-	except requests.RequestException as e:
-		log(f"Open-Meteo current weather failed for {lat},{lon}: {e}")
-		raise HTTPException(status_code=502, detail=f"Open-Meteo request failed: {e}")
+	data = await weather_and_forecast_data(lat, lon)
+	if data is None:
+		raise HTTPException(status_code=502, detail="Open-Meteo request failed")
+	return {"source": "open-meteo", "current_weather": data.get("current_weather")}
 
 
 @app.get("/forecast")
-def forecast(lat: float = Query(...), lon: float = Query(...), days: int = Query(14, ge=1, le=16)):
+async def forecast(lat: float = Query(...), lon: float = Query(...),
+				   days: int = Query(14, ge=1, le=FORECAST_MAX_DAYS)):
 	"""Returns daily forecast for 'days' days (default 14) using Open-Meteo daily forecast fields."""
-	url = f"{OPENMETEO_BASE}?latitude={lat}&longitude={lon}&daily=temperature_2m_max,temperature_2m_min,precipitation_sum&timezone=auto&forecast_days={days}"
-	try:
-		resp = requests.get(url, timeout=10)
-		resp.raise_for_status()
-		data = resp.json()
-		return {"source": "open-meteo", "daily": data.get("daily", {})}
-	except requests.RequestException as e:
-		log(f"Open-Meteo forecast failed for {lat},{lon}: {e}")
-
+	data = await weather_and_forecast_data(lat, lon)
+	if data is None:
 		# Fallback: naive forecast
-		try:
-			cw_url = f"{OPENMETEO_BASE}?latitude={lat}&longitude={lon}&current_weather=true&timezone=auto"
-			cw_resp = requests.get(cw_url, timeout=6)
-			cw_resp.raise_for_status()
-			temp = cw_resp.json().get("current_weather", {}).get("temperature", 20)
-		except Exception:
-			temp = 20
-
-		base = datetime.utcnow()
-		dates = [(base + timedelta(days=i)).date().isoformat() for i in range(days)]
-		tmax = [round(temp + 5 + random.uniform(-3, 3), 1) for _ in range(days)]
-		tmin = [round(temp - 2 + random.uniform(-3, 3), 1) for _ in range(days)]
-		precip = [round(max(0, random.uniform(0, 5)), 1) for _ in range(days)]
-
-		return {"source": "fallback", "daily": {"time": dates, "temperature_2m_max": tmax, "temperature_2m_min": tmin,
-												"precipitation_sum": precip}}
+		return {"source": "fallback", "daily": naive_forecast(days)}
+	return {"source": "open-meteo", "daily": first_days(data.get("daily", {}), days)}
+
+
+@app.get("/weather-and-forecast")
+async def weather_and_forecast(lat: float = Query(...), lon: float = Query(...),
+							   days: int = Query(14, ge=1, le=FORECAST_MAX_DAYS)):
+	"""Returns current weather and the daily forecast for 'days' days from one Open-Meteo request."""
+	data = await weather_and_forecast_data(lat, lon)
+	if data is None:
+		return {"source": "fallback", "current_weather": None, "daily": naive_forecast(days)}
+	return {
+		"source": "open-meteo",
+		"current_weather": data.get("current_weather"),
+		"daily": first_days(data.get("daily", {}), days),
+	}
 
 
 # Serve static files (frontend)